@@ -0,0 +1,124 @@
+"""
+Numba-compiled scoring kernels for AccidentDetectionModel
+Smart India Hackathon 2024
+
+Pure numeric versions of the per-sensor analysis in accident_detection.py.
+Results are built into Python objects by the caller. build_kernels.py
+compiles the scalar kernels ahead of time.
+
+numba is optional: without it the kernels run as plain Python, with the
+same results but without the speed-up.
+"""
+
+import math
+
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable bare or with options"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# dB level above which audio is treated as a crash sound
+AUDIO_CRASH_THRESHOLD = 80.0
+# Lower confidence bounds of MINOR, MODERATE and SEVERE
+SEVERITY_THRESHOLDS = (0.4, 0.6, 0.8)
+
+
+@njit(cache=True)
+def accel_confidence(accel_magnitude, inv_ta):
+    """Acceleration confidence; inv_ta is the reciprocal of the threshold"""
+    ratio = accel_magnitude * inv_ta
+    if ratio > 1.0:
+        return min(ratio, 3.0) * (1.0 / 3.0)
+    return 0.0
+
+
+@njit(cache=True)
+def gyro_confidence(gyro_magnitude, inv_tg):
+    """Gyroscope confidence; inv_tg is the reciprocal of the threshold"""
+    ratio = gyro_magnitude * inv_tg
+    if ratio > 1.0:
+        return min(ratio, 2.0) * 0.5
+    return 0.0
+
+
+@njit(cache=True)
+def speed_confidence(speed_change, inv_ts):
+    """Speed change confidence; inv_ts is the reciprocal of the threshold"""
+    ratio = speed_change * inv_ts
+    if ratio > 1.0:
+        return min(ratio, 2.0) * 0.5
+    return 0.0
+
+
+@njit(cache=True)
+def audio_confidence(audio_level):
+    """Audio confidence"""
+    if audio_level > AUDIO_CRASH_THRESHOLD:
+        return min(audio_level * 0.01, 1.0)
+    return 0.0
+
+
+@njit(cache=True)
+def confidences(accel_magnitude, gyro_magnitude, speed_change, audio_level,
+                inv_ta, inv_tg, inv_ts):
+    """Per-sensor confidence scores (acceleration, gyroscope, speed, audio)"""
+    return (accel_confidence(accel_magnitude, inv_ta),
+            gyro_confidence(gyro_magnitude, inv_tg),
+            speed_confidence(speed_change, inv_ts),
+            audio_confidence(audio_level))
+
+
+@njit(cache=True)
+def severity_code(total_confidence):
+    """Severity index into SEVERITY_LEVELS (0 = NONE ... 3 = SEVERE)"""
+    # Sum of comparisons instead of an if/elif chain, so no branches
+    minor, moderate, severe = SEVERITY_THRESHOLDS
+    return (int(total_confidence >= minor) +
+            int(total_confidence >= moderate) +
+            int(total_confidence >= severe))
+
+
+@njit(cache=True)
+def score(ax, ay, az, gx, gy, gz, speed, recent_speed, audio_level,
+          inv_ta, inv_tg, inv_ts, w_accel, w_gyro, w_speed, w_audio):
+    """
+    Score a single reading
+
+    Returns:
+        Tuple of (accel_confidence, gyro_confidence, speed_confidence,
+        audio_confidence, total_confidence, severity_code)
+    """
+    accel_magnitude = math.sqrt(ax * ax + ay * ay + az * az)
+    gyro_magnitude = math.sqrt(gx * gx + gy * gy + gz * gz)
+    speed_change = abs(recent_speed - speed)
+
+    accel, gyro, speed_conf, audio = confidences(
+        accel_magnitude, gyro_magnitude, speed_change, audio_level, inv_ta, inv_tg, inv_ts
+    )
+    total_confidence = accel * w_accel + gyro * w_gyro + speed_conf * w_speed + audio * w_audio
+    return accel, gyro, speed_conf, audio, total_confidence, severity_code(total_confidence)
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def score_batch(features, inv_ta, inv_tg, inv_ts, w_accel, w_gyro, w_speed, w_audio, out_conf, out_sev):
+    """
+    Score every row of an (N, 11) feature array laid out as FEATURE_NAMES
+
+    Writes the total confidence and severity code of row i into out_conf[i]
+    (float64, so the stored value is the one the severity was derived from)
+    and out_sev[i]. Rows are independent and scored in parallel.
+    """
+    for i in prange(features.shape[0]):
+        accel, gyro, speed_conf, audio = confidences(
+            features[i, 3], features[i, 7], abs(features[i, 9]), features[i, 10],
+            inv_ta, inv_tg, inv_ts
+        )
+        total_confidence = accel * w_accel + gyro * w_gyro + speed_conf * w_speed + audio * w_audio
+        out_conf[i] = total_confidence
+        out_sev[i] = severity_code(total_confidence)
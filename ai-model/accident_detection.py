@@ -5,10 +5,132 @@ Smart India Hackathon 2024
 This module implements accident detection using sensor data and machine learning.
 """
 
+import math
 import numpy as np
 import json
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple, Optional, Sequence, Union
+
+try:
+    # Ahead-of-time compiled kernels, built by build_kernels.py
+    from accident_kernels import (
+        accel_confidence, audio_confidence, gyro_confidence, score, speed_confidence
+    )
+except ImportError:
+    from _kernels import (
+        accel_confidence, audio_confidence, gyro_confidence, score, speed_confidence
+    )
+
+# Column layout of the batch feature array returned by preprocess_batch.
+# Matches AccidentDetectionTrainer.feature_names in train_model.py.
+FEATURE_NAMES = (
+    'accel_x', 'accel_y', 'accel_z', 'accel_magnitude',
+    'gyro_x', 'gyro_y', 'gyro_z', 'gyro_magnitude',
+    'speed', 'speed_change', 'audio_level'
+)
+# Raw input columns accepted by preprocess_batch in columnar form
+_RAW_COLUMNS = ('accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z', 'speed', 'audio_level')
+SEVERITY_LEVELS = ('NONE', 'MINOR', 'MODERATE', 'SEVERE')
+_SEVERITY_NAMES = np.array(SEVERITY_LEVELS)
+_NO_DESCRIPTIONS = ('', '', '', '')
+_ANALYSIS_SENSORS = ('acceleration', 'gyroscope', 'speed', 'audio')
+
+# Emergency response recommendations per severity, shared by all results
+_RECOMMENDATIONS = {
+    'SEVERE': (
+        "Immediately contact emergency services (911/108)",
+        "Dispatch ambulance and fire rescue",
+        "Alert nearby hospitals",
+        "Notify traffic control for road clearance",
+        "Send high-priority alerts to emergency contacts"
+    ),
+    'MODERATE': (
+        "Contact emergency services",
+        "Dispatch ambulance",
+        "Alert nearby medical facilities",
+        "Notify emergency contacts",
+        "Monitor situation closely"
+    ),
+    'MINOR': (
+        "Check for injuries",
+        "Contact emergency services if needed",
+        "Notify emergency contacts",
+        "Document incident details",
+        "Seek medical attention if required"
+    ),
+    'NONE': ()
+}
+
+
+@dataclass(slots=True)
+class AccidentResult:
+    """Prediction result for a single sensor reading"""
+    is_accident: bool
+    confidence_score: float
+    severity: str
+    timestamp: str
+    latitude: float
+    longitude: float
+    accel_confidence: float
+    gyro_confidence: float
+    speed_confidence: float
+    audio_confidence: float
+    # Per-sensor descriptions in _ANALYSIS_SENSORS order, empty unless is_accident
+    descriptions: Tuple[str, str, str, str] = _NO_DESCRIPTIONS
+    recommendations: Sequence[str] = ()
+    
+    def to_dict(self) -> Dict:
+        """Nested dictionary form of the result, e.g. for JSON serialization"""
+        confidences = (self.accel_confidence, self.gyro_confidence,
+                       self.speed_confidence, self.audio_confidence)
+        return {
+            'is_accident': self.is_accident,
+            'confidence_score': self.confidence_score,
+            'severity': self.severity,
+            'timestamp': self.timestamp,
+            'location': {
+                'latitude': self.latitude,
+                'longitude': self.longitude
+            },
+            'analysis': {
+                sensor: {'confidence': confidence, 'description': description}
+                for sensor, confidence, description
+                in zip(_ANALYSIS_SENSORS, confidences, self.descriptions)
+            },
+            'recommendations': list(self.recommendations)
+        }
+
+
+# Per-sensor pattern descriptions, shared by the analyze_*_pattern methods
+# and predict_accident
+def _describe_acceleration(confidence: float, magnitude: float) -> str:
+    if confidence > 0:
+        return f"Sudden impact detected (magnitude: {magnitude:.2f} m/s²)"
+    return "Normal acceleration pattern"
+
+
+def _describe_gyroscope(confidence: float, magnitude: float) -> str:
+    if confidence > 0:
+        return f"Vehicle rotation detected (magnitude: {magnitude:.2f} rad/s)"
+    return "Normal rotation pattern"
+
+
+def _describe_speed(confidence: float, speed_change: Optional[float]) -> str:
+    if speed_change is None:
+        return "Insufficient speed data"
+    if confidence > 0:
+        return f"Sudden speed change detected ({speed_change:.1f} km/h)"
+    return "Normal speed pattern"
+
+
+def _describe_audio(confidence: float, audio_level: float) -> str:
+    if confidence > 0:
+        return f"High audio level detected ({audio_level:.1f} dB)"
+    return "Normal audio level"
+
 
 class AccidentDetectionModel:
     """
@@ -29,19 +151,69 @@ class AccidentDetectionModel:
             'speed': 0.2,
             'audio': 0.1
         }
-        
-    def preprocess_sensor_data(self, raw_data: Dict) -> Dict:
+        # Rolling window of the last 3 speed readings seen by predict_accident
+        self._speed_window = deque(maxlen=3)
+        self._speed_sum = 0.0
+    
+    # Scoring uses the threshold reciprocals and a weight tuple; the setters
+    # below keep them in sync with the public attributes
+    
+    @property
+    def threshold_acceleration(self) -> float:
+        return self._threshold_acceleration
+    
+    @threshold_acceleration.setter
+    def threshold_acceleration(self, value: float) -> None:
+        self._threshold_acceleration = value
+        self._inv_thr_acc = 1.0 / value
+    
+    @property
+    def threshold_gyroscope(self) -> float:
+        return self._threshold_gyroscope
+    
+    @threshold_gyroscope.setter
+    def threshold_gyroscope(self, value: float) -> None:
+        self._threshold_gyroscope = value
+        self._inv_thr_gyr = 1.0 / value
+    
+    @property
+    def threshold_speed_change(self) -> float:
+        return self._threshold_speed_change
+    
+    @threshold_speed_change.setter
+    def threshold_speed_change(self, value: float) -> None:
+        self._threshold_speed_change = value
+        self._inv_thr_spd = 1.0 / value
+    
+    @property
+    def confidence_weights(self) -> Mapping[str, float]:
+        """Read-only view of the sensor weights; assign a new dict to change them"""
+        return self._confidence_weights
+    
+    @confidence_weights.setter
+    def confidence_weights(self, weights: Mapping[str, float]) -> None:
+        self._w = (weights['acceleration'], weights['gyroscope'], weights['speed'], weights['audio'])
+        self._confidence_weights = MappingProxyType(dict(weights))
+    
+    def preprocess_sensor_data(self, raw_data: Dict, default_ts: Optional[str] = None) -> Dict:
         """
         Preprocess raw sensor data for analysis
         
         Args:
             raw_data: Dictionary containing sensor readings
+            default_ts: Timestamp used when the reading has none. Pass one
+                timestamp captured per batch to avoid calling datetime.now()
+                for every reading.
             
         Returns:
             Processed sensor data
         """
+        timestamp = raw_data.get('timestamp')
+        if timestamp is None:
+            timestamp = default_ts if default_ts is not None else datetime.now().isoformat()
+        
         processed = {
-            'timestamp': raw_data.get('timestamp', datetime.now().isoformat()),
+            'timestamp': timestamp,
             'acceleration': {
                 'x': float(raw_data.get('accelerometer', {}).get('x', 0)),
                 'y': float(raw_data.get('accelerometer', {}).get('y', 0)),
@@ -61,22 +233,96 @@ class AccidentDetectionModel:
         }
         return processed
     
+    def preprocess_batch(self, raw: Union[Sequence[Dict], Mapping[str, Sequence[float]]],
+                         update_window: bool = False) -> np.ndarray:
+        """
+        Preprocess a batch of raw sensor readings into a feature array
+        
+        Args:
+            raw: Sequence of raw sensor reading dictionaries in stream order,
+                or already-parsed columns as a mapping from names in
+                _RAW_COLUMNS to equal-length 1-D arrays (missing columns are 0)
+            update_window: Continue from the model's rolling speed window and
+                push the batch's last speeds into it, so consecutive batches
+                of one stream see speed drops across batch boundaries. Only
+                set this once per reading: preprocessing the same readings
+                again, or also passing them to predict_accident without a
+                speed_history, feeds them into the window twice.
+            
+        Returns:
+            float32 array of shape (N, 11) with columns ordered as FEATURE_NAMES.
+            speed_change is the current speed minus the mean of up to three
+            preceding readings (0 while fewer than two exist).
+        """
+        if isinstance(raw, Mapping):
+            unknown = set(raw) - set(_RAW_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown columns: {sorted(unknown)}; expected names from {_RAW_COLUMNS}")
+            columns = {name: np.asarray(values, dtype=np.float32) for name, values in raw.items()}
+            lengths = {column.shape[0] if column.ndim == 1 else None for column in columns.values()}
+            if None in lengths or len(lengths) > 1:
+                raise ValueError("Columns must be 1-D arrays of equal length")
+            n = lengths.pop() if lengths else 0
+            features = np.zeros((n, len(FEATURE_NAMES)), dtype=np.float32)
+            for name, column in columns.items():
+                features[:, FEATURE_NAMES.index(name)] = column
+        else:
+            n = len(raw)
+            features = np.zeros((n, len(FEATURE_NAMES)), dtype=np.float32)
+            for i, reading in enumerate(raw):
+                accel = reading.get('accelerometer', {})
+                gyro = reading.get('gyroscope', {})
+                row = features[i]
+                row[0] = accel.get('x', 0)
+                row[1] = accel.get('y', 0)
+                row[2] = accel.get('z', 0)
+                row[4] = gyro.get('x', 0)
+                row[5] = gyro.get('y', 0)
+                row[6] = gyro.get('z', 0)
+                row[8] = reading.get('gps', {}).get('speed', 0)
+                row[10] = reading.get('audio_level', 0)
+        
+        features[:, 3], features[:, 7] = self.calculate_magnitudes_batch(features)
+        
+        # Prepend the rolling window so the first rows have history too
+        window = self._speed_window if update_window else ()
+        history = len(window)
+        speeds = np.concatenate((np.fromiter(window, dtype=np.float64, count=history),
+                                 features[:, 8]))
+        cumulative = np.concatenate(([0.0], np.cumsum(speeds)))
+        idx = np.arange(history, history + n)
+        count = np.minimum(idx, 3)
+        has_history = count >= 2
+        recent_speed = (cumulative[idx] - cumulative[idx - count]) / np.maximum(count, 1)
+        features[:, 9] = np.where(has_history, speeds[idx] - recent_speed, 0.0)
+        
+        if update_window:
+            for speed in features[-3:, 8]:
+                self.update_speed(float(speed))
+        
+        return features
+    
     def calculate_acceleration_magnitude(self, acceleration: Dict) -> float:
         """Calculate the magnitude of acceleration vector"""
-        return np.sqrt(
-            acceleration['x']**2 + 
-            acceleration['y']**2 + 
-            acceleration['z']**2
-        )
+        x, y, z = acceleration['x'], acceleration['y'], acceleration['z']
+        return math.sqrt(x*x + y*y + z*z)
     
     def calculate_gyroscope_magnitude(self, gyroscope: Dict) -> float:
         """Calculate the magnitude of gyroscope vector"""
-        return np.sqrt(
-            gyroscope['x']**2 + 
-            gyroscope['y']**2 + 
-            gyroscope['z']**2
+        x, y, z = gyroscope['x'], gyroscope['y'], gyroscope['z']
+        return math.sqrt(x*x + y*y + z*z)
+    
+    def calculate_magnitudes_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate acceleration and gyroscope magnitudes for every row of a feature array"""
+        return (
+            np.linalg.norm(features[:, 0:3], axis=1),
+            np.linalg.norm(features[:, 4:7], axis=1)
         )
     
+    def analyze_acceleration_score(self, acceleration: Dict) -> float:
+        """Confidence score for the acceleration pattern"""
+        return accel_confidence(self.calculate_acceleration_magnitude(acceleration), self._inv_thr_acc)
+    
     def analyze_acceleration_pattern(self, acceleration: Dict) -> Tuple[float, str]:
         """
         Analyze acceleration patterns for accident detection
@@ -85,12 +331,12 @@ class AccidentDetectionModel:
             Tuple of (confidence_score, pattern_description)
         """
         magnitude = self.calculate_acceleration_magnitude(acceleration)
-        
-        if magnitude > self.threshold_acceleration:
-            confidence = min(magnitude / self.threshold_acceleration, 3.0) / 3.0
-            return confidence, f"Sudden impact detected (magnitude: {magnitude:.2f} m/s²)"
-        
-        return 0.0, "Normal acceleration pattern"
+        confidence = accel_confidence(magnitude, self._inv_thr_acc)
+        return confidence, _describe_acceleration(confidence, magnitude)
+    
+    def analyze_gyroscope_score(self, gyroscope: Dict) -> float:
+        """Confidence score for the gyroscope pattern"""
+        return gyro_confidence(self.calculate_gyroscope_magnitude(gyroscope), self._inv_thr_gyr)
     
     def analyze_gyroscope_pattern(self, gyroscope: Dict) -> Tuple[float, str]:
         """
@@ -100,31 +346,70 @@ class AccidentDetectionModel:
             Tuple of (confidence_score, pattern_description)
         """
         magnitude = self.calculate_gyroscope_magnitude(gyroscope)
+        confidence = gyro_confidence(magnitude, self._inv_thr_gyr)
+        return confidence, _describe_gyroscope(confidence, magnitude)
+    
+    def update_speed(self, speed: float) -> None:
+        """Push a speed reading into the rolling speed window"""
+        window = self._speed_window
+        if len(window) == window.maxlen:
+            self._speed_sum -= window[0]
+        window.append(speed)
+        self._speed_sum += speed
+    
+    def recent_speed(self, previous_speeds: Optional[List[float]] = None) -> Optional[float]:
+        """
+        Average of the last 3 speed readings
         
-        if magnitude > self.threshold_gyroscope:
-            confidence = min(magnitude / self.threshold_gyroscope, 2.0) / 2.0
-            return confidence, f"Vehicle rotation detected (magnitude: {magnitude:.2f} rad/s)"
+        Args:
+            previous_speeds: Explicit speed history; the rolling window is used when omitted
+            
+        Returns:
+            Average speed, or None if fewer than 2 readings are available
+        """
+        if previous_speeds is None:
+            if len(self._speed_window) < 2:
+                return None
+            return self._speed_sum / len(self._speed_window)
         
-        return 0.0, "Normal rotation pattern"
+        if len(previous_speeds) < 2:
+            return None
+        last = previous_speeds[-3:]
+        return sum(last) / len(last)
     
-    def analyze_speed_pattern(self, current_speed: float, previous_speeds: List[float]) -> Tuple[float, str]:
+    def analyze_speed_score(self, current_speed: float,
+                            previous_speeds: Optional[List[float]] = None) -> float:
+        """Confidence score for the speed pattern (see analyze_speed_pattern)"""
+        recent_speed = self.recent_speed(previous_speeds)
+        if recent_speed is None:
+            return 0.0
+        return speed_confidence(abs(recent_speed - current_speed), self._inv_thr_spd)
+    
+    def analyze_speed_pattern(self, current_speed: float,
+                              previous_speeds: Optional[List[float]] = None) -> Tuple[float, str]:
         """
         Analyze speed patterns for sudden stops or crashes
         
+        Args:
+            current_speed: Current speed reading
+            previous_speeds: Explicit speed history; the rolling window is used when omitted
+        
         Returns:
             Tuple of (confidence_score, pattern_description)
         """
-        if len(previous_speeds) < 2:
-            return 0.0, "Insufficient speed data"
+        recent_speed = self.recent_speed(previous_speeds)
+        if recent_speed is None:
+            return 0.0, _describe_speed(0.0, None)
         
-        recent_speed = np.mean(previous_speeds[-3:])  # Average of last 3 readings
         speed_change = abs(recent_speed - current_speed)
-        
-        if speed_change > self.threshold_speed_change:
-            confidence = min(speed_change / self.threshold_speed_change, 2.0) / 2.0
-            return confidence, f"Sudden speed change detected ({speed_change:.1f} km/h)"
-        
-        return 0.0, "Normal speed pattern"
+        confidence = speed_confidence(speed_change, self._inv_thr_spd)
+        return confidence, _describe_speed(confidence, speed_change)
+    
+    def analyze_audio_score(self, audio_level: float) -> float:
+        """Confidence score for the audio level"""
+        # Simplified audio analysis - in real implementation, this would use
+        # more sophisticated audio processing and ML models
+        return audio_confidence(audio_level)
     
     def analyze_audio_pattern(self, audio_level: float) -> Tuple[float, str]:
         """
@@ -133,113 +418,149 @@ class AccidentDetectionModel:
         Returns:
             Tuple of (confidence_score, pattern_description)
         """
-        # Simplified audio analysis - in real implementation, this would use
-        # more sophisticated audio processing and ML models
-        crash_threshold = 80.0  # dB threshold for crash sounds
-        
-        if audio_level > crash_threshold:
-            confidence = min(audio_level / 100.0, 1.0)
-            return confidence, f"High audio level detected ({audio_level:.1f} dB)"
-        
-        return 0.0, "Normal audio level"
+        confidence = audio_confidence(audio_level)
+        return confidence, _describe_audio(confidence, audio_level)
     
-    def predict_accident(self, sensor_data: Dict, speed_history: List[float] = None) -> Dict:
+    def predict_accident(self, sensor_data: Union[Dict, np.ndarray],
+                         speed_history: List[float] = None,
+                         out: Optional[AccidentResult] = None) -> Union[AccidentResult, Dict]:
         """
         Main prediction function that analyzes all sensor data
         
         Args:
-            sensor_data: Processed sensor data
-            speed_history: List of previous speed readings
+            sensor_data: Processed sensor data, or a feature row/batch from
+                preprocess_batch (a single row is treated as a batch of one)
+            speed_history: List of previous speed readings. When omitted the
+                model's rolling speed window is used and then updated with
+                this reading. Ignored for arrays, which carry speed_change
+                as a column.
+            out: Existing AccidentResult to overwrite in place instead of
+                allocating a new one, for callers that do not retain results
             
         Returns:
-            Dictionary containing prediction results
+            AccidentResult for a single reading; its descriptions are left
+            empty unless an accident is detected. For array input, a
+            dictionary of arrays with one entry per row.
         """
+        if isinstance(sensor_data, np.ndarray):
+            confidence, severity_codes = self.predict_batch(np.atleast_2d(sensor_data))
+            return {
+                'is_accident': severity_codes > 0,
+                'confidence_score': confidence,
+                'severity': _SEVERITY_NAMES[severity_codes]
+            }
+        
+        acceleration = sensor_data['acceleration']
+        gyroscope = sensor_data['gyroscope']
+        gps = sensor_data['gps']
+        current_speed = gps['speed']
+        recent_speed = self.recent_speed(speed_history)
         if speed_history is None:
-            speed_history = []
+            self.update_speed(current_speed)
         
-        # Analyze each sensor type
-        accel_confidence, accel_desc = self.analyze_acceleration_pattern(sensor_data['acceleration'])
-        gyro_confidence, gyro_desc = self.analyze_gyroscope_pattern(sensor_data['gyroscope'])
-        speed_confidence, speed_desc = self.analyze_speed_pattern(
-            sensor_data['gps']['speed'], speed_history
+        (accel_confidence, gyro_confidence, speed_confidence, audio_confidence,
+         total_confidence, severity_idx) = score(
+            acceleration['x'], acceleration['y'], acceleration['z'],
+            gyroscope['x'], gyroscope['y'], gyroscope['z'],
+            # With too little history the speed change is scored as zero
+            current_speed, current_speed if recent_speed is None else recent_speed,
+            sensor_data['audio_level'],
+            self._inv_thr_acc, self._inv_thr_gyr, self._inv_thr_spd, *self._w
         )
-        audio_confidence, audio_desc = self.analyze_audio_pattern(sensor_data['audio_level'])
+        severity = SEVERITY_LEVELS[severity_idx]
+        is_accident = severity_idx > 0
         
-        # Calculate weighted confidence score
-        total_confidence = (
-            accel_confidence * self.confidence_weights['acceleration'] +
-            gyro_confidence * self.confidence_weights['gyroscope'] +
-            speed_confidence * self.confidence_weights['speed'] +
-            audio_confidence * self.confidence_weights['audio']
-        )
+        # Descriptions are only needed to report an accident
+        if is_accident:
+            descriptions = self._describe(
+                sensor_data, recent_speed,
+                (accel_confidence, gyro_confidence, speed_confidence, audio_confidence)
+            )
+        else:
+            descriptions = _NO_DESCRIPTIONS
+        
+        recommendations = self.get_recommendations(severity, total_confidence)
+        if out is None:
+            return AccidentResult(
+                is_accident=is_accident,
+                confidence_score=total_confidence,
+                severity=severity,
+                timestamp=sensor_data['timestamp'],
+                latitude=gps['latitude'],
+                longitude=gps['longitude'],
+                accel_confidence=accel_confidence,
+                gyro_confidence=gyro_confidence,
+                speed_confidence=speed_confidence,
+                audio_confidence=audio_confidence,
+                descriptions=descriptions,
+                recommendations=recommendations
+            )
         
-        # Determine severity level
-        if total_confidence >= 0.8:
-            severity = "SEVERE"
-            is_accident = True
-        elif total_confidence >= 0.6:
-            severity = "MODERATE"
-            is_accident = True
-        elif total_confidence >= 0.4:
-            severity = "MINOR"
-            is_accident = True
+        out.is_accident = is_accident
+        out.confidence_score = total_confidence
+        out.severity = severity
+        out.timestamp = sensor_data['timestamp']
+        out.latitude = gps['latitude']
+        out.longitude = gps['longitude']
+        out.accel_confidence = accel_confidence
+        out.gyro_confidence = gyro_confidence
+        out.speed_confidence = speed_confidence
+        out.audio_confidence = audio_confidence
+        out.descriptions = descriptions
+        out.recommendations = recommendations
+        return out
+    
+    def _describe(self, sensor_data: Dict, recent_speed: Optional[float],
+                  confidences: Tuple[float, float, float, float]) -> Tuple[str, str, str, str]:
+        """Build the per-sensor pattern descriptions for a scored reading"""
+        accel, gyro, speed, audio = confidences
+        if recent_speed is None:
+            speed_change = None
         else:
-            severity = "NONE"
-            is_accident = False
+            speed_change = abs(recent_speed - sensor_data['gps']['speed'])
         
-        return {
-            'is_accident': is_accident,
-            'confidence_score': total_confidence,
-            'severity': severity,
-            'timestamp': sensor_data['timestamp'],
-            'location': {
-                'latitude': sensor_data['gps']['latitude'],
-                'longitude': sensor_data['gps']['longitude']
-            },
-            'analysis': {
-                'acceleration': {'confidence': accel_confidence, 'description': accel_desc},
-                'gyroscope': {'confidence': gyro_confidence, 'description': gyro_desc},
-                'speed': {'confidence': speed_confidence, 'description': speed_desc},
-                'audio': {'confidence': audio_confidence, 'description': audio_desc}
-            },
-            'recommendations': self.get_recommendations(severity, total_confidence)
-        }
+        return (
+            _describe_acceleration(accel, self.calculate_acceleration_magnitude(sensor_data['acceleration'])),
+            _describe_gyroscope(gyro, self.calculate_gyroscope_magnitude(sensor_data['gyroscope'])),
+            _describe_speed(speed, speed_change),
+            _describe_audio(audio, sensor_data['audio_level'])
+        )
     
-    def get_recommendations(self, severity: str, confidence: float) -> List[str]:
-        """Get emergency response recommendations based on severity"""
-        recommendations = []
+    def predict_batch(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a batch of readings in parallel
         
-        if severity == "SEVERE":
-            recommendations.extend([
-                "Immediately contact emergency services (911/108)",
-                "Dispatch ambulance and fire rescue",
-                "Alert nearby hospitals",
-                "Notify traffic control for road clearance",
-                "Send high-priority alerts to emergency contacts"
-            ])
-        elif severity == "MODERATE":
-            recommendations.extend([
-                "Contact emergency services",
-                "Dispatch ambulance",
-                "Alert nearby medical facilities",
-                "Notify emergency contacts",
-                "Monitor situation closely"
-            ])
-        elif severity == "MINOR":
-            recommendations.extend([
-                "Check for injuries",
-                "Contact emergency services if needed",
-                "Notify emergency contacts",
-                "Document incident details",
-                "Seek medical attention if required"
-            ])
+        Args:
+            features: (N, 11) feature array from preprocess_batch
+            
+        Returns:
+            Tuple of (confidence_scores, severity_codes). Severity codes index
+            into SEVERITY_LEVELS.
+        """
+        # The parallel batch kernel is always JIT-compiled (pycc cannot build
+        # parallel=True code), so numba is only imported once batches are used
+        from _kernels import score_batch
         
-        return recommendations
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        n = features.shape[0]
+        out_conf = np.empty(n, dtype=np.float64)
+        out_sev = np.empty(n, dtype=np.int8)
+        score_batch(
+            features,
+            self._inv_thr_acc, self._inv_thr_gyr, self._inv_thr_spd, *self._w,
+            out_conf, out_sev
+        )
+        return out_conf, out_sev
+    
+    def get_recommendations(self, severity: str, confidence: float) -> Tuple[str, ...]:
+        """Get emergency response recommendations based on severity"""
+        return _RECOMMENDATIONS.get(severity, ())
 
 # Example usage and testing functions
 def simulate_accident_scenario():
     """Simulate different accident scenarios for testing"""
     model = AccidentDetectionModel()
+    timestamp = datetime.now().isoformat()
     
     # Scenario 1: High-impact collision
     collision_data = {
@@ -247,7 +568,7 @@ def simulate_accident_scenario():
         'gyroscope': {'x': 2.0, 'y': 7.0, 'z': 1.0},
         'gps': {'latitude': 12.9716, 'longitude': 77.5946, 'speed': 15.0},
         'audio_level': 95.0,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': timestamp
     }
     
     # Scenario 2: Vehicle rollover
@@ -256,7 +577,7 @@ def simulate_accident_scenario():
         'gyroscope': {'x': 8.0, 'y': 2.0, 'z': 6.0},
         'gps': {'latitude': 12.9716, 'longitude': 77.5946, 'speed': 5.0},
         'audio_level': 75.0,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': timestamp
     }
     
     # Scenario 3: Normal driving
@@ -265,7 +586,7 @@ def simulate_accident_scenario():
         'gyroscope': {'x': 0.1, 'y': 0.2, 'z': 0.1},
         'gps': {'latitude': 12.9716, 'longitude': 77.5946, 'speed': 45.0},
         'audio_level': 60.0,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': timestamp
     }
     
     scenarios = [
@@ -280,7 +601,7 @@ def simulate_accident_scenario():
     
     for scenario_name, data in scenarios:
         processed_data = model.preprocess_sensor_data(data)
-        result = model.predict_accident(processed_data, speed_history)
+        result = model.predict_accident(processed_data, speed_history).to_dict()
         
         print(f"Scenario: {scenario_name}")
         print(f"Accident Detected: {result['is_accident']}")
@@ -289,7 +610,8 @@ def simulate_accident_scenario():
         print(f"Location: {result['location']['latitude']}, {result['location']['longitude']}")
         print("Analysis:")
         for sensor, analysis in result['analysis'].items():
-            print(f"  {sensor.capitalize()}: {analysis['description']} (confidence: {analysis['confidence']:.3f})")
+            description = f"{analysis['description']} " if analysis['description'] else ""
+            print(f"  {sensor.capitalize()}: {description}(confidence: {analysis['confidence']:.3f})")
         print("Recommendations:")
         for i, rec in enumerate(result['recommendations'], 1):
             print(f"  {i}. {rec}")
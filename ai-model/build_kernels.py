@@ -0,0 +1,42 @@
+"""
+Ahead-of-time compilation of the scoring kernels
+Smart India Hackathon 2024
+
+Builds the accident_kernels extension module next to this file from the
+scalar kernels in _kernels.py, so single-reading scoring starts without
+any JIT compilation. accident_detection.py falls back to the JIT kernels
+when the extension has not been built for the current platform.
+
+score_batch is deliberately not exported: pycc cannot compile
+parallel=True, so an AOT build would run its prange loop serially.
+predict_batch keeps using the parallel JIT kernel, which is compiled (or
+loaded from numba's cache) the first time a batch is scored.
+
+Usage: python build_kernels.py
+"""
+
+import os
+
+from numba.pycc import CC
+
+import _kernels
+
+cc = CC('accident_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Scalar arguments are float64 to match what the JIT kernels see from Python
+for name, signature in (
+    ('accel_confidence', 'f8(f8, f8)'),
+    ('gyro_confidence', 'f8(f8, f8)'),
+    ('speed_confidence', 'f8(f8, f8)'),
+    ('audio_confidence', 'f8(f8)'),
+):
+    cc.export(name, signature)(getattr(_kernels, name).py_func)
+cc.export(
+    'score',
+    'Tuple((f8, f8, f8, f8, f8, i8))(f8, f8, f8, f8, f8, f8, f8, f8, f8, '
+    'f8, f8, f8, f8, f8, f8, f8)'
+)(_kernels.score.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,71 @@
+"""
+Regression tests for AccidentDetectionModel scoring
+Smart India Hackathon 2024
+
+The batch path (preprocess_batch + predict_batch) must agree with
+predict_accident reading by reading, including at severity cut-offs.
+"""
+
+import numpy as np
+import pytest
+
+from accident_detection import AccidentDetectionModel, SEVERITY_LEVELS
+
+
+def _raw_stream(n_readings=2000, seed=7):
+    """Random raw readings covering normal driving and crash-level values"""
+    rng = np.random.default_rng(seed)
+    accel = rng.normal(0, 20, (n_readings, 3)).astype(np.float32)
+    gyro = rng.normal(0, 6, (n_readings, 3)).astype(np.float32)
+    speed = rng.uniform(0, 120, n_readings).astype(np.float32)
+    audio = rng.uniform(40, 120, n_readings).astype(np.float32)
+    return [
+        {
+            'accelerometer': dict(zip('xyz', map(float, accel[i]))),
+            'gyroscope': dict(zip('xyz', map(float, gyro[i]))),
+            'gps': {'speed': float(speed[i])},
+            'audio_level': float(audio[i])
+        }
+        for i in range(n_readings)
+    ]
+
+
+def test_batch_matches_scalar_over_split_stream():
+    raws = _raw_stream()
+
+    scalar_model = AccidentDetectionModel()
+    scalar = [scalar_model.predict_accident(scalar_model.preprocess_sensor_data(raw)) for raw in raws]
+
+    # Uneven chunks so batch boundaries fall at different window fill levels
+    batch_model = AccidentDetectionModel()
+    confidences, severities = [], []
+    for chunk in np.array_split(np.arange(len(raws)), [1, 3, 500, 1201]):
+        features = batch_model.preprocess_batch([raws[i] for i in chunk], update_window=True)
+        conf, sev = batch_model.predict_batch(features)
+        confidences.append(conf)
+        severities.append(sev)
+    confidences = np.concatenate(confidences)
+    severities = np.concatenate(severities)
+
+    assert [SEVERITY_LEVELS[code] for code in severities] == [result.severity for result in scalar]
+    np.testing.assert_allclose(confidences, [result.confidence_score for result in scalar], atol=1e-6)
+
+
+def test_severity_boundary_reading():
+    # Total confidence is 0.7999999999999999, just under the SEVERE cut-off
+    raw = {
+        'accelerometer': {'x': -50.0, 'y': 0.0, 'z': 0.0},
+        'gyroscope': {'x': 12.0, 'y': 0.0, 'z': 0.0},
+        'gps': {'speed': 0.0},
+        'audio_level': 110.0
+    }
+    model = AccidentDetectionModel()
+
+    result = model.predict_accident(model.preprocess_sensor_data(raw))
+    assert result.severity == 'MODERATE'
+    assert result.confidence_score == pytest.approx(0.8)
+
+    # The stored confidence must be the value the severity was derived from
+    confidences, severities = model.predict_batch(model.preprocess_batch([raw]))
+    assert SEVERITY_LEVELS[severities[0]] == 'MODERATE'
+    assert float(confidences[0]) == result.confidence_score
@@ -5,77 +5,84 @@ Smart India Hackathon 2024
 
 import tensorflow as tf
 import numpy as np
-import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-import joblib
 import os
+import json
 
 class AccidentDetectionTrainer:
     """Train and export TensorFlow Lite model for accident detection"""
     
     def __init__(self):
         self.model = None
-        self.scaler = StandardScaler()
+        # Copy of self.model with the feature scaling folded in (raw input)
+        self.inference_model = None
+        self._predict_fn = None
+        # fp16 interpreter serving predict_sample, and the int8 flatbuffer
+        self._interpreter = None
+        self._int8_model = None
+        # Training-set feature statistics; self.model takes standardized input
+        self.feature_mean = None
+        self.feature_std = None
         self.feature_names = [
             'accel_x', 'accel_y', 'accel_z', 'accel_magnitude',
             'gyro_x', 'gyro_y', 'gyro_z', 'gyro_magnitude',
             'speed', 'speed_change', 'audio_level'
         ]
+        # Column layout of the array returned by generate_synthetic_data
+        self.column_names = [
+            'accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z',
+            'speed', 'speed_change', 'audio_level', 'is_accident',
+            'accel_magnitude', 'gyro_magnitude'
+        ]
+        self.feature_columns = [self.column_names.index(name) for name in self.feature_names]
+        self.label_column = self.column_names.index('is_accident')
     
     def generate_synthetic_data(self, n_samples=10000):
-        """Generate synthetic training data for demonstration"""
-        np.random.seed(42)
+        """
+        Generate synthetic training data for demonstration
+        
+        Returns:
+            float32 array of shape (n_samples, 12) with columns ordered as
+            self.column_names
+        """
+        rng = np.random.default_rng(42)
+        data = np.empty((n_samples, len(self.column_names)), dtype=np.float32)
+        # One standard normal draw for the whole buffer; `out=` needs a
+        # contiguous array, so the label and magnitude columns are drawn too
+        # and overwritten below
+        rng.standard_normal(dtype=np.float32, out=data)
         
+        # Per raw column: accel x/y/z, gyro x/y/z, speed, speed_change, audio_level
         # Normal driving scenarios (70% of data)
         normal_samples = int(n_samples * 0.7)
-        normal_data = {
-            'accel_x': np.random.normal(0, 2, normal_samples),
-            'accel_y': np.random.normal(0, 2, normal_samples),
-            'accel_z': np.random.normal(9.8, 1, normal_samples),
-            'gyro_x': np.random.normal(0, 0.5, normal_samples),
-            'gyro_y': np.random.normal(0, 0.5, normal_samples),
-            'gyro_z': np.random.normal(0, 0.5, normal_samples),
-            'speed': np.random.normal(40, 15, normal_samples),
-            'speed_change': np.random.normal(0, 5, normal_samples),
-            'audio_level': np.random.normal(60, 10, normal_samples),
-            'is_accident': np.zeros(normal_samples)
-        }
+        normal = data[:normal_samples]
+        normal_means = np.array([0, 0, 9.8, 0, 0, 0, 40, 0, 60], dtype=np.float32)
+        normal_stds = np.array([2, 2, 1, 0.5, 0.5, 0.5, 15, 5, 10], dtype=np.float32)
+        normal[:, :9] *= normal_stds
+        normal[:, :9] += normal_means
+        normal[:, 9] = 0
         
         # Accident scenarios (30% of data)
-        accident_samples = n_samples - normal_samples
-        accident_data = {
-            'accel_x': np.random.normal(-15, 8, accident_samples),
-            'accel_y': np.random.normal(0, 10, accident_samples),
-            'accel_z': np.random.normal(5, 8, accident_samples),
-            'gyro_x': np.random.normal(0, 3, accident_samples),
-            'gyro_y': np.random.normal(0, 5, accident_samples),
-            'gyro_z': np.random.normal(0, 3, accident_samples),
-            'speed': np.random.normal(20, 15, accident_samples),
-            'speed_change': np.random.normal(-25, 10, accident_samples),
-            'audio_level': np.random.normal(85, 15, accident_samples),
-            'is_accident': np.ones(accident_samples)
-        }
-        
-        # Combine data
-        data = {}
-        for key in normal_data.keys():
-            data[key] = np.concatenate([normal_data[key], accident_data[key]])
+        accident = data[normal_samples:]
+        accident_means = np.array([-15, 0, 5, 0, 0, 0, 20, -25, 85], dtype=np.float32)
+        accident_stds = np.array([8, 10, 8, 3, 5, 3, 15, 10, 15], dtype=np.float32)
+        accident[:, :9] *= accident_stds
+        accident[:, :9] += accident_means
+        accident[:, 9] = 1
         
         # Add derived features
-        data['accel_magnitude'] = np.sqrt(
-            data['accel_x']**2 + data['accel_y']**2 + data['accel_z']**2
-        )
-        data['gyro_magnitude'] = np.sqrt(
-            data['gyro_x']**2 + data['gyro_y']**2 + data['gyro_z']**2
-        )
+        accel = data[:, 0:3]
+        gyro = data[:, 3:6]
+        np.sqrt(np.einsum('ij,ij->i', accel, accel), out=data[:, 10])
+        np.sqrt(np.einsum('ij,ij->i', gyro, gyro), out=data[:, 11])
         
-        return pd.DataFrame(data)
+        return data
     
     def build_model(self, input_shape):
         """Build neural network model"""
         model = tf.keras.Sequential([
-            tf.keras.layers.Dense(128, activation='relu', input_shape=(input_shape,)),
+            tf.keras.Input(shape=(input_shape,), dtype='float32'),
+            tf.keras.layers.Dense(128, activation='relu'),
             tf.keras.layers.Dropout(0.3),
             tf.keras.layers.Dense(64, activation='relu'),
             tf.keras.layers.Dropout(0.2),
@@ -91,14 +98,41 @@ class AccidentDetectionTrainer:
         
         return model
     
+    def fold_scaling_into_model(self, model):
+        """
+        Absorb the (x - mean) / std feature scaling into the first Dense layer
+        of model so it consumes raw features
+        
+        Only applied to export copies: self.model keeps standardized input.
+        """
+        dense = model.layers[0]
+        W, b = dense.get_weights()
+        scale = 1.0 / self.feature_std
+        W_folded = W * scale[:, None]
+        b_folded = b - (self.feature_mean * scale) @ W
+        dense.set_weights([W_folded.astype(np.float32), b_folded.astype(np.float32)])
+    
+    def build_predict_fn(self):
+        """Compile a single-row inference function with a fixed input signature"""
+        model = self.inference_model
+        
+        @tf.function(
+            input_signature=[tf.TensorSpec([1, len(self.feature_names)], tf.float32)],
+            jit_compile=True
+        )
+        def predict(x):
+            return model(x, training=False)
+        
+        return predict
+    
     def train(self, save_model=True):
         """Train the accident detection model"""
         print("Generating synthetic training data...")
-        df = self.generate_synthetic_data()
+        data = self.generate_synthetic_data()
         
         # Prepare features and labels
-        X = df[self.feature_names].values
-        y = df['is_accident'].values
+        X = data[:, self.feature_columns]
+        y = data[:, self.label_column]
         
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
@@ -106,8 +140,11 @@ class AccidentDetectionTrainer:
         )
         
         # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        self.feature_mean = X_train.mean(axis=0)
+        std = X_train.std(axis=0)
+        self.feature_std = np.where(std > 0, std, 1).astype(np.float32)
+        X_train_scaled = (X_train - self.feature_mean) / self.feature_std
+        X_test_scaled = (X_test - self.feature_mean) / self.feature_std
         
         # Build and train model
         print("Building and training model...")
@@ -140,30 +177,91 @@ class AccidentDetectionTrainer:
         print(f"Test Recall: {test_recall:.4f}")
         print(f"F1 Score: {2 * (test_precision * test_recall) / (test_precision + test_recall):.4f}")
         
+        # Raw-feature copy for serving; self.model keeps standardized input
+        self.inference_model = self.build_inference_model(fold_scaling=True)
+        self._predict_fn = self.build_predict_fn()
+        
         if save_model:
             self.save_model()
+            self.evaluate_int8(X_test, y_test, self.model.predict(X_test_scaled, verbose=0)[:, 0])
         
         return history
     
     def save_model(self):
-        """Save model and scaler"""
+        """Save model"""
         os.makedirs('models', exist_ok=True)
         
-        # Save TensorFlow model
-        self.model.save('models/accident_detection_model.h5')
-        print("Saved TensorFlow model to models/accident_detection_model.h5")
+        # Save TensorFlow model (raw feature input)
+        self.inference_model.save('models/accident_detection_model.keras')
+        print("Saved TensorFlow model to models/accident_detection_model.keras")
         
-        # Save scaler
-        joblib.dump(self.scaler, 'models/scaler.pkl')
-        print("Saved scaler to models/scaler.pkl")
+        # Feature statistics for consumers of the int8 model
+        with open('models/feature_scaling.json', 'w') as f:
+            json.dump({
+                'feature_names': self.feature_names,
+                'mean': self.feature_mean.tolist(),
+                'std': self.feature_std.tolist()
+            }, f, indent=2)
+        print("Saved feature scaling to models/feature_scaling.json")
         
         # Convert to TensorFlow Lite
         self.convert_to_tflite()
     
+    def build_inference_model(self, fold_scaling=False):
+        """
+        Copy of the trained model without Dropout layers, used for export
+        
+        The copy takes standardized features like self.model, or raw
+        features when fold_scaling is set.
+        """
+        layers = [tf.keras.Input(shape=(len(self.feature_names),), dtype='float32')]
+        layers += [
+            layer.__class__.from_config(layer.get_config())
+            for layer in self.model.layers
+            if not isinstance(layer, tf.keras.layers.Dropout)
+        ]
+        inference_model = tf.keras.Sequential(layers)
+        # Dropout has no weights, so the weight lists line up
+        inference_model.set_weights(self.model.get_weights())
+        if fold_scaling:
+            self.fold_scaling_into_model(inference_model)
+        return inference_model
+    
+    def _tflite_converter(self, model):
+        """TFLite converter with graph-level optimizations enabled"""
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        converter.experimental_new_converter = True
+        converter.experimental_enable_resource_variables = True
+        return converter
+    
+    def representative_dataset(self, n_samples=500):
+        """Yield standardized sample inputs used to calibrate int8 quantization"""
+        X = self.generate_synthetic_data(n_samples)[:, self.feature_columns]
+        X = (X - self.feature_mean) / self.feature_std
+        for row in X:
+            yield [row.reshape(1, -1)]
+    
     def convert_to_tflite(self):
-        """Convert model to TensorFlow Lite format"""
-        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        """
+        Convert model to TensorFlow Lite format
+        
+        Writes a fully int8-quantized model taking standardized features and
+        an fp16-weight model taking raw features, for devices running the
+        XNNPACK delegate (see training_notebook.md).
+        """
+        # Float32 conversion, only used as a size baseline
+        float_model = self._tflite_converter(self.inference_model).convert()
+        
+        # The int8 model keeps standardized input. Raw features range from
+        # ~0.5 (gyro std) to ~100 (audio), so a single per-tensor input scale
+        # would leave the small-range features only a few quantization steps.
+        # Callers standardize with models/feature_scaling.json first.
+        converter = self._tflite_converter(self.build_inference_model())
         converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = self.representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
         
         # Convert model
         tflite_model = converter.convert()
@@ -174,9 +272,86 @@ class AccidentDetectionTrainer:
         
         print("Saved TensorFlow Lite model to models/accident_detection.tflite")
         
-        # Get model size
+        # FP16 weights for ARM devices running the XNNPACK delegate
+        fp16_converter = self._tflite_converter(self.inference_model)
+        fp16_converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        fp16_converter.target_spec.supported_types = [tf.float16]
+        fp16_model = fp16_converter.convert()
+        
+        with open('models/accident_detection_fp16.tflite', 'wb') as f:
+            f.write(fp16_model)
+        
+        print("Saved FP16 TensorFlow Lite model to models/accident_detection_fp16.tflite")
+        
+        # Get model sizes
+        float_size = len(float_model) / 1024  # KB
         model_size = len(tflite_model) / 1024  # KB
-        print(f"TFLite model size: {model_size:.2f} KB")
+        print(f"TFLite model size (float32): {float_size:.2f} KB")
+        print(f"TFLite model size (int8): {model_size:.2f} KB")
+        print(f"TFLite model size (fp16): {len(fp16_model) / 1024:.2f} KB")
+        
+        # The fp16 model takes raw features, so predict_sample needs no
+        # scaling or quantization around the interpreter call
+        self._interpreter = tf.lite.Interpreter(model_content=fp16_model)
+        self._interpreter.allocate_tensors()
+        self._int8_model = tflite_model
+    
+    def _predict_tflite(self, features):
+        """Run the cached fp16 TFLite interpreter on a raw float32 feature row"""
+        input_details = self._interpreter.get_input_details()[0]
+        output_details = self._interpreter.get_output_details()[0]
+        
+        self._interpreter.set_tensor(input_details['index'], features)
+        self._interpreter.invoke()
+        return float(self._interpreter.get_tensor(output_details['index'])[0][0])
+    
+    def predict_int8(self, X):
+        """
+        Run the int8 TFLite model on raw float32 feature rows
+        
+        Returns:
+            float32 array of accident probabilities, one per row
+        """
+        interpreter = tf.lite.Interpreter(model_content=self._int8_model)
+        input_index = interpreter.get_input_details()[0]['index']
+        interpreter.resize_tensor_input(input_index, X.shape)
+        interpreter.allocate_tensors()
+        input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+        
+        X_scaled = (X - self.feature_mean) / self.feature_std
+        input_scale, input_zero_point = input_details['quantization']
+        quantized = np.round(X_scaled / input_scale + input_zero_point)
+        quantized = np.clip(quantized, -128, 127).astype(np.int8)
+        
+        interpreter.set_tensor(input_details['index'], quantized)
+        interpreter.invoke()
+        output = interpreter.get_tensor(output_details['index'])[:, 0]
+        
+        output_scale, output_zero_point = output_details['quantization']
+        return (output.astype(np.float32) - output_zero_point) * output_scale
+    
+    def evaluate_int8(self, X_test, y_test, keras_probabilities):
+        """Report int8 TFLite accuracy against the Keras model on the test set"""
+        int8_probabilities = self.predict_int8(X_test)
+        keras_pred = keras_probabilities > 0.5
+        int8_pred = int8_probabilities > 0.5
+        labels = y_test > 0.5
+        
+        results = {
+            'keras_accuracy': float(np.mean(keras_pred == labels)),
+            'int8_accuracy': float(np.mean(int8_pred == labels)),
+            'agreement': float(np.mean(int8_pred == keras_pred)),
+            'max_probability_error': float(np.max(np.abs(int8_probabilities - keras_probabilities)))
+        }
+        
+        print("\nInt8 TFLite vs Keras (test set):")
+        print(f"Keras Accuracy: {results['keras_accuracy']:.4f}")
+        print(f"Int8 Accuracy: {results['int8_accuracy']:.4f}")
+        print(f"Prediction Agreement: {results['agreement']:.4f}")
+        print(f"Max Probability Error: {results['max_probability_error']:.4f}")
+        
+        return results
     
     def predict_sample(self, sensor_data):
         """Make prediction on sample data"""
@@ -189,13 +364,13 @@ class AccidentDetectionTrainer:
             sensor_data['accel_magnitude'], sensor_data['gyro_x'], sensor_data['gyro_y'],
             sensor_data['gyro_z'], sensor_data['gyro_magnitude'], sensor_data['speed'],
             sensor_data['speed_change'], sensor_data['audio_level']
-        ]])
-        
-        # Scale features
-        features_scaled = self.scaler.transform(features)
+        ]], dtype=np.float32)
         
-        # Predict
-        prediction = self.model.predict(features_scaled)[0][0]
+        # Predict on raw features; scaling is folded into the served model
+        if self._interpreter is not None:
+            prediction = self._predict_tflite(features)
+        else:
+            prediction = float(self._predict_fn(features)[0, 0])
         
         return {
             'accident_probability': float(prediction),
@@ -237,9 +412,10 @@ def main():
     
     print("\n=== Training Complete ===")
     print("Models saved in 'models/' directory:")
-    print("- accident_detection_model.h5 (TensorFlow)")
-    print("- accident_detection.tflite (TensorFlow Lite)")
-    print("- scaler.pkl (Feature scaler)")
+    print("- accident_detection_model.keras (TensorFlow)")
+    print("- accident_detection.tflite (TensorFlow Lite, int8 quantized, standardized input)")
+    print("- feature_scaling.json (mean/std for the int8 model's input)")
+    print("- accident_detection_fp16.tflite (TensorFlow Lite, fp16 weights for XNNPACK)")
 
 if __name__ == "__main__":
     main()